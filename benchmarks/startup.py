@@ -0,0 +1,93 @@
+"""
+启动耗时基准测试
+
+测量两项指标（均为多次运行的中位数）：
+  import:         python -c "import http_server.server" 相对于 python -c "pass" 多出的耗时
+  first request:  从启动服务器进程到收到第一个响应的耗时
+
+用法：python benchmarks/startup.py [-n 运行次数] [--max-import-ms 毫秒] [--max-first-request-ms 毫秒]
+任一指标超过给定上限时以非零状态码退出，可直接用于 CI
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+RootDir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ServerScript: str = '''
+import sys
+from http_server.server import Server
+Server('127.0.0.1', int(sys.argv[1])).set_static_dir(sys.argv[2]).run()
+'''
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_command(args: list[str]) -> float:
+    start: float = time.perf_counter()
+    subprocess.run(args, cwd=RootDir, check=True)
+    return time.perf_counter() - start
+
+
+def time_first_request(timeout: float = 10.0) -> float:
+    port: int = get_free_port()
+    static_dir: str = os.path.join(RootDir, 'www')
+
+    start: float = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, '-c', ServerScript, str(port), static_dir], cwd=RootDir)
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=timeout) as conn:
+                    conn.sendall(b'HEAD / HTTP/1.1\r\nHost: localhost\r\n\r\n')
+                    if conn.recv(1024).startswith(b'HTTP/1.1'):
+                        return time.perf_counter() - start
+            except OSError:
+                # 服务器尚未开始监听
+                time.sleep(0.001)
+        raise TimeoutError('Server did not answer within the timeout.')
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Measure http_server startup latency.')
+    parser.add_argument('-n', type=int, default=10, help='number of runs')
+    parser.add_argument('--max-import-ms', type=float, default=None, help='fail if import overhead exceeds this')
+    parser.add_argument(
+        '--max-first-request-ms', type=float, default=None, help='fail if first request latency exceeds this'
+    )
+    args = parser.parse_args()
+
+    baseline: list[float] = [time_command([sys.executable, '-c', 'pass']) for _ in range(args.n)]
+    imports: list[float] = [time_command([sys.executable, '-c', 'import http_server.server']) for _ in range(args.n)]
+    first_requests: list[float] = [time_first_request() for _ in range(args.n)]
+
+    import_ms: float = (statistics.median(imports) - statistics.median(baseline)) * 1000
+    first_request_ms: float = statistics.median(first_requests) * 1000
+    print(f'import:        {import_ms:8.2f} ms')
+    print(f'first request: {first_request_ms:8.2f} ms')
+
+    failures: list[str] = []
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        failures.append(f'import {import_ms:.2f} ms > {args.max_import_ms:.2f} ms')
+    if args.max_first_request_ms is not None and first_request_ms > args.max_first_request_ms:
+        failures.append(f'first request {first_request_ms:.2f} ms > {args.max_first_request_ms:.2f} ms')
+
+    for failure in failures:
+        print(f'over budget: {failure}', file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
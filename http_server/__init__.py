@@ -0,0 +1,31 @@
+import importlib
+
+# 公开名称 -> 所在模块
+# 包本身不导入任何子模块，首次访问某个名称时才导入对应模块（PEP 562）
+LazyExports: dict[str, str] = {
+    'Server': 'http_server.server',
+    'Request': 'http_server.request',
+    'Response': 'http_server.response',
+    'DefaultHeaders': 'http_server.response',
+    'HttpStatus': 'http_server.http_status',
+    'MimeList': 'http_server.mime',
+    'AccessLog': 'http_server.access_log',
+    'AccessLogEntry': 'http_server.access_log',
+}
+
+__all__ = list(LazyExports)
+
+
+def __getattr__(name: str):
+    module_name: str | None = LazyExports.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    value = getattr(importlib.import_module(module_name), name)
+    # 写回模块命名空间，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(LazyExports))
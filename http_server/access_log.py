@@ -0,0 +1,338 @@
+import io
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from collections.abc import Callable
+
+# 支持的日志格式
+LogFormats: tuple[str, ...] = ('common', 'combined', 'json')
+
+# 与 Apache 一致的转义规则：" -> \"，\ -> \\，控制字符 -> \xHH
+LogEscapeTable: dict[int, str] = {
+    **{i: f'\\x{i:02x}' for i in range(0x20)},
+    0x7f: '\\x7f',
+    ord('"'): '\\"',
+    ord('\\'): '\\\\'
+}
+
+
+def escape_log_field(value: str) -> str:
+    """
+    转义来自客户端的日志字段，防止客户端伪造日志字段或换行
+    :param value: 原始字段
+    :return: 转义后的字段
+    """
+
+    return value.translate(LogEscapeTable)
+
+
+class AccessLogEntry:
+    """
+    一条访问日志记录\n
+    请求线程只负责收集原始字段，格式化与写盘都在后台线程中完成
+    """
+
+    remote_addr: str
+    timestamp: float
+    method: str
+    full_path: str
+    http_version: str
+    status: int
+    size: int
+    referer: str | None
+    user_agent: str | None
+    duration: float
+
+    def __init__(
+        self,
+        remote_addr: str,
+        timestamp: float,
+        method: str,
+        full_path: str,
+        http_version: str,
+        status: int,
+        size: int,
+        referer: str | None = None,
+        user_agent: str | None = None,
+        duration: float = 0.0
+    ) -> None:
+        self.remote_addr = remote_addr
+        self.timestamp = timestamp
+        self.method = method
+        self.full_path = full_path
+        self.http_version = http_version
+        self.status = status
+        self.size = size
+        self.referer = referer
+        self.user_agent = user_agent
+        self.duration = duration
+
+
+def format_common(entry: AccessLogEntry) -> str:
+    """
+    Common Log Format\n
+    例：127.0.0.1 - - [10/Oct/2000:13:55:36 +0800] "GET / HTTP/1.1" 200 2326
+    """
+
+    t: str = datetime.fromtimestamp(entry.timestamp).astimezone().strftime('%d/%b/%Y:%H:%M:%S %z')
+    size: str = str(entry.size) if entry.size > 0 else '-'
+    request_line: str = escape_log_field(f'{entry.method} {entry.full_path} {entry.http_version}')
+    return f'{entry.remote_addr} - - [{t}] "{request_line}" {entry.status} {size}'
+
+
+def format_combined(entry: AccessLogEntry) -> str:
+    """
+    Combined Log Format（在 Common Log Format 的基础上追加 Referer 与 User-Agent）
+    """
+
+    referer: str = escape_log_field(entry.referer) if entry.referer else '-'
+    user_agent: str = escape_log_field(entry.user_agent) if entry.user_agent else '-'
+    return f'{format_common(entry)} "{referer}" "{user_agent}"'
+
+
+def format_json(entry: AccessLogEntry) -> str:
+    """
+    JSON Lines 格式，每条记录占一行
+    """
+
+    return json.dumps({
+        'remote_addr': entry.remote_addr,
+        'time': datetime.fromtimestamp(entry.timestamp).astimezone().isoformat(),
+        'method': entry.method,
+        'path': entry.full_path,
+        'http_version': entry.http_version,
+        'status': entry.status,
+        'size': entry.size,
+        'referer': entry.referer,
+        'user_agent': entry.user_agent,
+        'duration_ms': round(entry.duration * 1000, 3)
+    }, ensure_ascii=False)
+
+
+class AccessLog:
+    # 日志文件路径
+    __file_path: str
+    # 格式化函数
+    __formatter: Callable[[AccessLogEntry], str]
+    # 有界队列，请求线程只做入队操作
+    __queue: queue.Queue
+    # 单次批量写入的最大条数
+    __batch_size: int
+    # 批量写入的最长等待时间（秒）：从收到一批中的第一条日志开始计时，凑满 batch_size 时提前写入
+    __flush_interval: float
+    # 按大小轮转的阈值（字节），0 表示不按大小轮转
+    __max_bytes: int
+    # 按时间轮转的间隔（秒），0 表示不按时间轮转
+    __rotate_interval: float
+    # 保留的历史日志文件数量
+    __backup_count: int
+    # 队列已满时是否阻塞请求线程（False 则丢弃该条日志）
+    __block_on_full: bool
+    # 因队列已满而被丢弃的日志条数
+    __dropped: int
+    # 当前打开的日志文件
+    __file: io.TextIOWrapper | None
+    # 下一次按时间轮转的时间点
+    __next_rollover: float
+    # 后台写入线程
+    __worker: threading.Thread
+    # 关闭标记（队列中的哨兵对象）
+    __sentinel: object
+
+    def __init__(
+        self,
+        file_path: str,
+        log_format: str = 'common',
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 0,
+        rotate_interval: float = 0,
+        backup_count: int = 5,
+        block_on_full: bool = False
+    ) -> None:
+        """
+        :param file_path: 日志文件路径
+        :param log_format: 'common' | 'combined' | 'json'
+        :param max_queue_size: 队列容量
+        :param batch_size: 单次批量写入的最大条数
+        :param flush_interval: 批量写入的最长等待时间（秒），从收到一批中的第一条日志开始计时，凑满 batch_size 时提前写入
+        :param max_bytes: 单个日志文件的最大字节数，0 表示不按大小轮转
+        :param rotate_interval: 按时间轮转的间隔（秒），0 表示不按时间轮转
+        :param backup_count: 保留的历史日志文件数量
+        :param block_on_full: 队列已满时阻塞请求线程（True）或丢弃日志（False）
+        """
+
+        if log_format not in LogFormats:
+            raise ValueError(f'Unsupported access log format: {log_format}')
+
+        self.__file_path = file_path
+        self.__formatter = {
+            'common': format_common,
+            'combined': format_combined,
+            'json': format_json
+        }[log_format]
+        self.__queue = queue.Queue(maxsize=max_queue_size)
+        self.__batch_size = max(1, batch_size)
+        self.__flush_interval = flush_interval
+        self.__max_bytes = max_bytes
+        self.__rotate_interval = rotate_interval
+        self.__backup_count = backup_count
+        self.__block_on_full = block_on_full
+        self.__dropped = 0
+        self.__file = None
+        self.__next_rollover = time.time() + rotate_interval if rotate_interval > 0 else 0
+        self.__sentinel = object()
+
+        self.__worker = threading.Thread(target=self.__run, name='AccessLogWriter', daemon=True)
+        self.__worker.start()
+
+    @property
+    def dropped(self) -> int:
+        """
+        因队列已满而被丢弃的日志条数
+        """
+
+        return self.__dropped
+
+    def log(self, entry: AccessLogEntry) -> None:
+        """
+        提交一条访问日志（不做任何格式化与 IO）
+        :param entry: 访问日志记录
+        """
+
+        if self.__block_on_full:
+            self.__queue.put(entry)
+            return
+
+        try:
+            self.__queue.put_nowait(entry)
+        except queue.Full:
+            self.__dropped += 1
+
+    def close(self, timeout: float | None = None) -> None:
+        """
+        写完队列中剩余的日志后关闭日志文件
+        :param timeout: 等待后台线程退出的最长时间（秒）
+        """
+
+        if not self.__worker.is_alive():
+            return
+
+        # 队列已满时放入哨兵对象同样受 timeout 限制
+        try:
+            self.__queue.put(self.__sentinel, timeout=timeout)
+        except queue.Full:
+            return
+        self.__worker.join(timeout)
+
+    def __open(self) -> io.TextIOWrapper:
+        if self.__file is None:
+            self.__file = open(self.__file_path, 'a', encoding='utf-8')
+        return self.__file
+
+    def __current_size(self) -> int:
+        if self.__file is not None:
+            return self.__file.tell()
+
+        try:
+            return os.path.getsize(self.__file_path)
+        except OSError:
+            return 0
+
+    def __should_rotate(self, pending_bytes: int) -> bool:
+        time_due: bool = self.__rotate_interval > 0 and time.time() >= self.__next_rollover
+
+        # 日志文件不存在或为空时不轮转，避免空文件把真正的历史日志挤出 backup_count
+        if self.__current_size() == 0:
+            if time_due:
+                self.__next_rollover = time.time() + self.__rotate_interval
+            return False
+
+        if time_due:
+            return True
+
+        if self.__max_bytes > 0:
+            return self.__current_size() + pending_bytes > self.__max_bytes
+
+        return False
+
+    def __rotate(self) -> None:
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+        if self.__backup_count > 0:
+            # access.log.4 -> access.log.5, ..., access.log -> access.log.1
+            for i in range(self.__backup_count - 1, 0, -1):
+                src: str = f'{self.__file_path}.{i}'
+                if os.path.exists(src):
+                    os.replace(src, f'{self.__file_path}.{i + 1}')
+            if os.path.exists(self.__file_path):
+                os.replace(self.__file_path, f'{self.__file_path}.1')
+        elif os.path.exists(self.__file_path):
+            os.remove(self.__file_path)
+
+        if self.__rotate_interval > 0:
+            self.__next_rollover = time.time() + self.__rotate_interval
+
+    def __write(self, batch: list[AccessLogEntry]) -> None:
+        lines: list[str] = []
+        for entry in batch:
+            try:
+                lines.append(self.__formatter(entry))
+            except Exception as err:
+                print(err)
+        if not lines:
+            return
+
+        data: str = '\n'.join(lines) + '\n'
+        try:
+            if self.__should_rotate(len(data.encode('utf-8'))):
+                self.__rotate()
+            file: io.TextIOWrapper = self.__open()
+            file.write(data)
+            file.flush()
+        except OSError as err:
+            print(err)
+
+    def __run(self) -> None:
+        running: bool = True
+        while running:
+            batch: list[AccessLogEntry] = []
+
+            # 等待第一条日志，超时后也检查一次是否需要按时间轮转
+            try:
+                item = self.__queue.get(timeout=self.__flush_interval)
+            except queue.Empty:
+                item = None
+
+            # 收到第一条日志后继续攒批，直到凑满 batch_size 或等待满 flush_interval
+            deadline: float = time.monotonic() + self.__flush_interval
+            while item is not None:
+                if item is self.__sentinel:
+                    running = False
+                    break
+                batch.append(item)
+                if len(batch) >= self.__batch_size:
+                    break
+
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.__queue.get(timeout=remaining)
+                except queue.Empty:
+                    item = None
+
+            if batch:
+                self.__write(batch)
+            elif self.__rotate_interval > 0 and self.__should_rotate(0):
+                self.__rotate()
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
@@ -0,0 +1,93 @@
+import io
+import queue
+import sys
+import threading
+
+# 错误日志队列容量，队列已满时丢弃新的错误信息
+ErrorQueueSize: int = 1000
+
+
+class ErrorLog:
+    """
+    错误日志\n
+    请求线程只做入队操作，转换为字符串与写入输出流都在后台线程中完成
+    """
+
+    # 有界队列
+    __queue: queue.Queue
+    # 输出流（None 表示写入时的 sys.stdout）
+    __stream: io.TextIOBase | None
+    # 因队列已满而被丢弃的错误信息条数
+    __dropped: int
+    # 后台写入线程
+    __worker: threading.Thread
+
+    def __init__(self, stream: io.TextIOBase | None = None, max_queue_size: int = ErrorQueueSize) -> None:
+        """
+        :param stream: 输出流，默认写入 sys.stdout
+        :param max_queue_size: 队列容量
+        """
+
+        self.__queue = queue.Queue(maxsize=max_queue_size)
+        self.__stream = stream
+        self.__dropped = 0
+        self.__worker = threading.Thread(target=self.__run, name='ErrorLogWriter', daemon=True)
+        self.__worker.start()
+
+    @property
+    def dropped(self) -> int:
+        """
+        因队列已满而被丢弃的错误信息条数
+        """
+
+        return self.__dropped
+
+    def log(self, message: object) -> None:
+        """
+        提交一条错误信息（不做任何格式化与 IO）
+        :param message: 错误信息或异常实例
+        """
+
+        try:
+            self.__queue.put_nowait(message)
+        except queue.Full:
+            self.__dropped += 1
+
+    def __run(self) -> None:
+        while True:
+            lines: list[str] = [str(self.__queue.get())]
+
+            # 把已经在排队的错误信息一起写出
+            while True:
+                try:
+                    lines.append(str(self.__queue.get_nowait()))
+                except queue.Empty:
+                    break
+
+            stream: io.TextIOBase = self.__stream if self.__stream is not None else sys.stdout
+            try:
+                stream.write('\n'.join(lines) + '\n')
+                stream.flush()
+            except (OSError, ValueError):
+                pass
+
+
+# 默认错误日志，首次使用时才启动后台线程
+DefaultErrorLog: ErrorLog | None = None
+DefaultErrorLogLock: threading.Lock = threading.Lock()
+
+
+def log_error(message: object) -> None:
+    """
+    通过默认错误日志记录一条错误信息
+    :param message: 错误信息或异常实例
+    """
+
+    global DefaultErrorLog
+
+    if DefaultErrorLog is None:
+        with DefaultErrorLogLock:
+            if DefaultErrorLog is None:
+                DefaultErrorLog = ErrorLog()
+
+    DefaultErrorLog.log(message)
@@ -1,4 +1,7 @@
-MimeList: dict[str, str] = {
+from types import MappingProxyType
+
+# 只读查询表：小写扩展名 -> mime 类型（扩展名必须为小写）
+MimeList: MappingProxyType = MappingProxyType({
     ".html": "text/html",
     ".htm": "text/html",
     ".shtml": "text/html",
@@ -103,4 +106,7 @@ MimeList: dict[str, str] = {
     ".asf": "video/x-ms-asf",
     ".wmv": "video/x-ms-wmv",
     ".avi": "video/x-msvideo"
-}
+})
+
+# 未知扩展名使用的 mime 类型
+DefaultMime: str = 'text/plain'
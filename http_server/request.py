@@ -1,8 +1,9 @@
 import socket
-from tempfile import NamedTemporaryFile
 from os import path
 import os
 
+from http_server.error_log import log_error
+
 
 def parse_query_string(query_string: str) -> dict[str, any]:
     data: dict[str, any] = {}
@@ -24,7 +25,7 @@ def parse_query_string(query_string: str) -> dict[str, any]:
             # 提取键、值并保存到字典
             data[pair_str[:i]] = pair_str[i + 1:]
     except Exception as err:
-        print(err)
+        log_error(err)
 
     return data
 
@@ -61,7 +62,7 @@ def parse_header(header_list: tuple[str, ...]) -> dict[str, str]:
             value = item[i + 1:].strip()
             data[key] = value
         except ValueError:
-            print(f"Error parsing header '{item}': Missing valid name-value structure.")
+            log_error(f"Error parsing header '{item}': Missing valid name-value structure.")
             continue
 
     return data
@@ -76,6 +77,9 @@ def process_xform_data(sock_conn: socket.socket, container: bytearray, content_l
 
 
 def process_file_upload(sock_conn: socket.socket, container: bytearray, content_length: int) -> str:
+    # tempfile 导入开销较大，只在真正接收文件时导入
+    from tempfile import NamedTemporaryFile
+
     f = NamedTemporaryFile(delete=False)
     received_length = 0
     while received_length < content_length:
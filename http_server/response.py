@@ -1,17 +1,38 @@
+import functools
+import io
 import os.path
-from typing import BinaryIO
 
 import socket
 from os import path
 
 from http_server.http_status import HttpStatus
-from http_server.mime import MimeList
+from http_server.error_log import log_error
+from http_server.mime import MimeList, DefaultMime
 
 DefaultHeaders: dict[str, str] = {}
 
 
+@functools.lru_cache(maxsize=1024)
+def get_ext_name(file_path: str) -> str:
+    """
+    提取文件扩展名（小写，结果会被缓存）
+    :param file_path: 文件路径
+    :return: 扩展名，例如 '.html'
+    """
+
+    return path.splitext(file_path)[1].lower()
+
+
+@functools.lru_cache(maxsize=1024)
 def get_mime(ext_name: str, encoding: str = 'utf-8') -> str:
-    return f'{MimeList[ext_name]}; charset=utf-8' if ext_name in MimeList.keys() else 'text/plain; charset=utf-8'
+    """
+    根据扩展名获取 Content-Type（不区分大小写，MimeList 只读，因此结果会被缓存）
+    :param ext_name: 扩展名，例如 '.html'
+    :param encoding: charset
+    :return: Content-Type
+    """
+
+    return f'{MimeList.get(ext_name.lower(), DefaultMime)}; charset={encoding}'
 
 
 class Response:
@@ -23,12 +44,19 @@ class Response:
     __headers: dict[str, any]
     # 缓存的响应头
     __cached_header: str | None
+    # 已发送的响应体字节数（用于访问日志）
+    __sent_bytes: int
+    # 是否只发送响应头（用于 HEAD 请求）
+    __head_only: bool
 
-    def __init__(self, conn: socket.socket) -> None:
+    def __init__(self, conn: socket.socket, head_only: bool = False) -> None:
         self.__conn = conn
         self.__status = HttpStatus.No_Content
-        self.__headers = DefaultHeaders
+        # 复制一份默认响应头，避免本次响应设置的响应头影响后续响应
+        self.__headers = dict(DefaultHeaders)
         self.__cached_header = None
+        self.__sent_bytes = 0
+        self.__head_only = head_only
 
     def allow_cors(self):
         """
@@ -49,6 +77,22 @@ class Response:
         self.__status = status
         return self
 
+    def get_status(self) -> HttpStatus:
+        """
+        获取 HTTP 响应状态
+        :return: HttpStatus 枚举值
+        """
+
+        return self.__status
+
+    def get_sent_bytes(self) -> int:
+        """
+        获取已发送的响应体字节数（不含响应头）
+        :return: 字节数
+        """
+
+        return self.__sent_bytes
+
     def set_header(self, key: str, value: any):
         """
         设置 HTTP 响应头
@@ -138,6 +182,19 @@ class Response:
         self.__cached_header = None
         return self
 
+    def __send_with_body(self, body: str):
+        """
+        发送携带数据的响应报文（HEAD 请求只发送响应头，但 Content-Length 保持不变）
+        :param body: 要发送的数据
+        """
+
+        if self.__head_only:
+            self.send()
+            return
+
+        self.__conn.sendall(self.__generate_http_response_message(body).encode('utf-8'))
+        self.__sent_bytes += self.__headers['Content-Length']
+
     def send(self):
         """
         直接发送响应报文而不携带数据
@@ -157,7 +214,7 @@ class Response:
         self.__status = HttpStatus.OK
         self.__headers['Content-Type'] = 'text/plain; charset=utf-8'
         self.__headers['Content-Length'] = len(text.encode('utf-8'))
-        self.__conn.sendall(self.__generate_http_response_message(text).encode('utf-8'))
+        self.__send_with_body(text)
         return self
 
     def send_html(self, html_str: str):
@@ -170,7 +227,7 @@ class Response:
         self.__status = HttpStatus.OK
         self.__headers['Content-Type'] = 'text/html; charset=utf-8'
         self.__headers['Content-Length'] = len(html_str.encode('utf-8'))
-        self.__conn.sendall(self.__generate_http_response_message(html_str).encode('utf-8'))
+        self.__send_with_body(html_str)
         return self
 
     def send_json(self, json_str: str):
@@ -183,14 +240,14 @@ class Response:
         self.__status = HttpStatus.OK
         self.__headers['Content-Type'] = 'application/json; charset=utf-8'
         self.__headers['Content-Length'] = len(json_str.encode('utf-8'))
-        self.__conn.sendall(self.__generate_http_response_message(json_str).encode('utf-8'))
+        self.__send_with_body(json_str)
         return self
 
     def send_file(self, file_path: str):
         self.__status = HttpStatus.OK
 
         # 文件扩展名
-        ext_name: str = f'{path.splitext(file_path)[1]}'
+        ext_name: str = get_ext_name(file_path)
         # 文件大小（字节）
         file_size: int = os.path.getsize(file_path)
         # 文件分块发送的块大小（MB）
@@ -205,9 +262,13 @@ class Response:
         # 先发送不携带文件数据的响应头
         self.send()
 
+        # HEAD 请求只需要响应头，不打开文件
+        if self.__head_only:
+            return self
+
         try:
             # 以二进制读模式打开文件, 无需关心文件类型和编码
-            file: BinaryIO = open(file_path, 'rb')
+            file: io.BufferedReader = open(file_path, 'rb')
             # 分块发送文件数据给客户端
             while True:
                 # 读取 1MB
@@ -216,11 +277,12 @@ class Response:
                     break
                 # 发送给客户端
                 self.__conn.sendall(data)
+                self.__sent_bytes += len(data)
         except FileNotFoundError as err:
-            print(err)
+            log_error(err)
             self.set_status(HttpStatus.Not_Found).end()
         except Exception as err:
-            print(err)
+            log_error(err)
             self.set_status(HttpStatus.Not_Found).end()
 
         return self
@@ -1,6 +1,10 @@
-import functools
-from typing import Callable
+from collections.abc import Callable
 import os
+import posixpath
+import signal
+import sys
+import threading
+import time
 
 import socket
 from socket import socket as create_socket
@@ -8,6 +12,22 @@ from socket import socket as create_socket
 from http_server.request import Request
 from http_server.response import Response
 from http_server.http_status import HttpStatus
+from http_server.error_log import log_error
+
+# 等价于 typing.TYPE_CHECKING，但不必在运行时导入 typing
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    # 访问日志是可选功能，运行时只在用到时才导入
+    from http_server.access_log import AccessLog, AccessLogEntry
+
+# 热重载时用于把监听 socket 的文件描述符传递给新进程的环境变量
+ListenFdEnv: str = 'PYWEB_LISTEN_FD'
+# accept 的轮询间隔（秒），决定收到停止信号后多久能退出 accept 循环
+AcceptPollInterval: float = 0.5
+# 静态文件路径缓存的最大条目数
+StaticCacheSize: int = 1024
+# 服务器支持的全部请求方法（用于 OPTIONS * 与 Allow 响应头）
+SupportedMethods: tuple[str, ...] = ('GET', 'HEAD', 'POST', 'OPTIONS')
 
 
 class Server:
@@ -16,22 +36,112 @@ class Server:
     __static_dir: str
     __get: dict[str, Callable[[Request, Response], None]]
     __post: dict[str, Callable[[Request, Response], None]]
+    __access_log: 'AccessLog | None'
+    # AccessLogEntry 类（设置访问日志时才导入）
+    __access_log_entry: 'type[AccessLogEntry] | None'
+    # 监听队列长度（热重载期间新连接会暂存在这里）
+    __backlog: int
+    # 监听 socket
+    __listener: socket.socket | None
+    # 正在处理的连接
+    __conn: socket.socket | None
+    # accept 循环是否继续
+    __running: bool
+    # 退出 accept 循环后是否以继承监听 socket 的方式重新执行本进程
+    __reloading: bool
+    # 优雅关闭时等待正在处理的请求完成的最长时间（秒）
+    __drain_timeout: float
+    # 优雅关闭的截止时间（time.monotonic）
+    __drain_deadline: float
+    # 已请求停止（唤醒看门狗线程）
+    __stop_event: threading.Event
+    # accept 循环已退出（看门狗线程无需再强制断开连接）
+    __drained_event: threading.Event
+    # 每个连接单次读写操作的超时时间（秒）
+    __conn_timeout: float
+    # run() 之前注册的信号处理函数：信号 -> 处理函数
+    __previous_handlers: dict[int, object]
+    # 静态文件路径缓存：规范化后的请求路径 -> 文件路径
+    __static_cache: dict[str, str]
+    # CORS 预检响应头（None 表示不响应 CORS 预检）
+    __cors_headers: dict[str, str] | None
+    # OPTIONS 响应头缓存：允许的请求方法 -> 预先生成的 Allow、Access-Control-* 响应头
+    # 以请求方法组合为键，条目数量有限，且每次请求都会按当前路由与静态文件重新计算允许的方法
+    __options_cache: dict[tuple[str, ...], dict[str, str]]
 
-    def __init__(self, host: str, port: int):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        backlog: int = socket.SOMAXCONN,
+        drain_timeout: float = 10.0,
+        conn_timeout: float = 30.0
+    ):
         self.__host = host
         self.__port = port
         self.__static_dir = ''
         self.__get = {}
         self.__post = {}
+        self.__access_log = None
+        self.__access_log_entry = None
+        self.__backlog = backlog
+        self.__listener = None
+        self.__conn = None
+        self.__running = False
+        self.__reloading = False
+        self.__drain_timeout = drain_timeout
+        self.__drain_deadline = 0.0
+        self.__stop_event = threading.Event()
+        self.__drained_event = threading.Event()
+        self.__conn_timeout = conn_timeout
+        self.__previous_handlers = {}
+        self.__static_cache = {}
+        self.__cors_headers = None
+        self.__options_cache = {}
 
-    def __process_static(self, req_path: str, res: Response) -> None:
-        req_path = req_path.lstrip('/')
-        file_path: str = os.path.join(self.__static_dir, req_path)
+    def __resolve_static(self, req_path: str) -> str | None:
+        """
+        把请求路径解析为静态文件路径（命中后写入缓存）
+        :param req_path: 请求路径
+        :return: 文件路径 | 不存在或位于静态目录之外则返回 None
+        """
+
+        # 规范化请求路径，'/./a'、'/.//a'、'/b/../a' 等别名对应同一个缓存键
+        key: str = posixpath.normpath('/' + req_path.lstrip('/'))
+
+        file_path: str | None = self.__static_cache.get(key)
+        if file_path is not None:
+            # 文件可能已被删除，此时让缓存失效
+            if os.path.isfile(file_path):
+                return file_path
+            del self.__static_cache[key]
+
+        static_root: str = os.path.abspath(self.__static_dir)
+        file_path = os.path.abspath(os.path.join(static_root, key.lstrip('/')))
+
+        # 拒绝逃出静态目录的路径
+        try:
+            if os.path.commonpath([static_root, file_path]) != static_root:
+                return None
+        except ValueError:
+            return None
 
         if os.path.isdir(file_path):
             file_path = os.path.join(file_path, 'index.html')
 
-        if not os.path.exists(file_path):
+        if not os.path.isfile(file_path):
+            return None
+
+        # 缓存已满时淘汰最早写入的条目
+        if len(self.__static_cache) >= StaticCacheSize:
+            del self.__static_cache[next(iter(self.__static_cache))]
+        self.__static_cache[key] = file_path
+        return file_path
+
+    def __process_static(self, req_path: str, res: Response) -> None:
+        file_path: str | None = self.__resolve_static(req_path)
+
+        if file_path is None:
             res.set_status(HttpStatus.Not_Found).send().close()
             return
 
@@ -51,15 +161,83 @@ class Server:
             return None
         func(req, res)
 
-    def __process_request(self, conn: socket.socket) -> None:
+    def __allowed_methods(self, req_path: str) -> tuple[str, ...] | None:
+        """
+        获取请求路径允许的请求方法
+        :param req_path: 请求路径
+        :return: 请求方法 | 路径不存在则返回 None
+        """
+
+        if req_path == '*':
+            return SupportedMethods
+
+        has_get: bool = req_path in self.__get or self.__resolve_static(req_path) is not None
+        has_post: bool = req_path in self.__post
+        if not has_get and not has_post:
+            return None
+
+        methods: list[str] = []
+        if has_get:
+            methods.extend(('GET', 'HEAD'))
+        if has_post:
+            methods.append('POST')
+        methods.append('OPTIONS')
+        return tuple(methods)
+
+    def __process_options(self, req: Request, res: Response) -> None:
+        methods: tuple[str, ...] | None = self.__allowed_methods(req.path)
+        if methods is None:
+            res.set_status(HttpStatus.Not_Found).send().close()
+            return
+
+        headers: dict[str, str] | None = self.__options_cache.get(methods)
+        if headers is None:
+            # 204 响应不能携带 Content-Length（RFC 9110 §8.6）
+            allow: str = ', '.join(methods)
+            headers = {'Allow': allow}
+            if self.__cors_headers is not None:
+                headers['Access-Control-Allow-Methods'] = allow
+                headers.update(self.__cors_headers)
+            self.__options_cache[methods] = headers
+
+        for k, v in headers.items():
+            res.set_header(k, v)
+        res.set_status(HttpStatus.No_Content).send()
+
+    def __log_access(self, addr: tuple, req: Request, res: Response, received: float, start: float) -> None:
+        # 只收集原始字段，格式化与写盘交给 AccessLog 的后台线程
+        self.__access_log.log(self.__access_log_entry(
+            remote_addr=addr[0] if addr else '-',
+            timestamp=received,
+            method=req.method,
+            full_path=req.full_path,
+            http_version=req.http_version,
+            status=res.get_status().value,
+            size=res.get_sent_bytes(),
+            referer=req.headers.get('Referer'),
+            user_agent=req.headers.get('User-Agent'),
+            duration=time.perf_counter() - start
+        ))
+
+    def __process_request(self, conn: socket.socket, addr: tuple = ()) -> None:
+        # 接收请求的时间（CLF 中的 %t）与用于计算耗时的起点
+        received: float = time.time()
+        start: float = time.perf_counter()
+        req: Request | None = None
+        res: Response | None = None
         try:
             req = Request(conn)
-            res = Response(conn)
+            # HEAD 请求复用 GET 的处理流程，但只发送响应头
+            res = Response(conn, head_only=req.method == 'HEAD')
 
-            if req.method == 'GET':
+            if req.method == 'GET' or req.method == 'HEAD':
                 self.__process_get(req, res)
                 return
 
+            if req.method == 'OPTIONS':
+                self.__process_options(req, res)
+                return
+
             if req.method == 'POST':
                 self.__process_post(req, res)
                 return
@@ -67,45 +245,252 @@ class Server:
             res.set_status(HttpStatus.Bad_Request).send().close()
 
         except Exception as err:
-            print(err)
+            log_error(err)
             try:
                 if not conn.recv(1) or conn.fileno() == -1:
                     return
             except Exception as inner_err:
-                print(inner_err)
+                log_error(inner_err)
                 return
-            Response(conn).set_status(HttpStatus.Internal_Server_Error).send().close()
+            res = Response(conn)
+            res.set_status(HttpStatus.Internal_Server_Error).send().close()
+
+        finally:
+            if self.__access_log is not None and req is not None and res is not None:
+                self.__log_access(addr, req, res, received, start)
 
     def set_static_dir(self, path: str):
         self.__static_dir = path
+        self.__static_cache.clear()
         return self
 
-    def run(self) -> None:
+    def set_cors(self, allow_origin: str = '*', allow_headers: str = '*', max_age: int = 86400):
+        """
+        开启 CORS 预检响应（OPTIONS 请求会额外携带 Access-Control-* 响应头）
+        :param allow_origin: Access-Control-Allow-Origin
+        :param allow_headers: Access-Control-Allow-Headers
+        :param max_age: Access-Control-Max-Age（秒）
+        :return: 链式调用实例
+        """
+
+        self.__cors_headers = {
+            'Access-Control-Allow-Origin': allow_origin,
+            'Access-Control-Allow-Headers': allow_headers,
+            'Access-Control-Max-Age': str(max_age)
+        }
+        self.__options_cache.clear()
+        return self
+
+    def set_access_log(self, access_log: 'AccessLog | None'):
+        """
+        设置访问日志（传入 None 则关闭访问日志）
+        :param access_log: AccessLog 实例
+        :return: 链式调用实例
+        """
+
+        # 访问日志模块只在这里导入一次，避免在每个请求中执行 import
+        from http_server.access_log import AccessLogEntry
+
+        self.__access_log = access_log
+        self.__access_log_entry = AccessLogEntry
+        return self
+
+    def warm_up(self):
+        """
+        预热静态文件缓存：遍历静态目录并解析所有文件的请求路径
+        :return: 链式调用实例
+        """
+
+        if not self.__static_dir or not os.path.isdir(self.__static_dir):
+            return self
+
+        for root, _dirs, files in os.walk(self.__static_dir):
+            rel_dir: str = os.path.relpath(root, self.__static_dir).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir + '/'
+
+            # 目录本身（指向 index.html）
+            if 'index.html' in files:
+                self.__resolve_static('/' + rel_dir)
+
+            for name in files:
+                self.__resolve_static(f'/{rel_dir}{name}')
+
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        优雅关闭：不再接受新连接，等待正在处理的请求完成\n
+        超过 timeout 后由看门狗线程强制断开正在处理的连接（shutdown），阻塞中的 socket 读写会立即返回\n
+        该期限只约束 socket 读写：处理函数中的 sleep 或 CPU 密集计算不会被打断，会一直运行到结束
+        :param timeout: 等待正在处理的请求完成的最长时间（秒），默认使用 drain_timeout
+        """
+
+        self.__drain_deadline = time.monotonic() + (self.__drain_timeout if timeout is None else timeout)
+        self.__running = False
+        self.__stop_event.set()
+
+    def reload(self) -> None:
+        """
+        热重载：优雅关闭后重新执行本进程，新进程直接继承监听 socket，期间的新连接暂存在监听队列中
+        """
+
+        self.__reloading = True
+        self.stop()
+
+    def __watch_drain(self) -> None:
+        self.__stop_event.wait()
+
+        # 截止时间之前 accept 循环已退出则无需处理
+        if self.__drained_event.wait(max(0.0, self.__drain_deadline - time.monotonic())):
+            return
+
+        # 强制断开正在处理的连接，阻塞中的 recv / send 会立即返回
+        conn: socket.socket | None = self.__conn
+        if conn is None:
+            return
+        try:
+            conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def __handle_stop_signal(self, _signum: int, _frame) -> None:
+        # 热重载期间收到停止信号：取消重载，排空后直接退出
+        if self.__reloading:
+            self.__reloading = False
+            return
+
+        # 第二次收到停止信号时立即退出
+        if not self.__running:
+            raise SystemExit(1)
+        self.stop()
+
+    def __handle_reload_signal(self, _signum: int, _frame) -> None:
+        if not self.__running:
+            return
+        self.reload()
+
+    def __install_signal_handlers(self) -> None:
+        # 只有主线程可以注册信号处理函数
+        if threading.current_thread() is not threading.main_thread():
+            return
+
+        handlers: dict[int, Callable] = {
+            signal.SIGINT: self.__handle_stop_signal,
+            signal.SIGTERM: self.__handle_stop_signal
+        }
+        # Windows 下没有 SIGHUP
+        if hasattr(signal, 'SIGHUP'):
+            handlers[signal.SIGHUP] = self.__handle_reload_signal
+
+        # 记录原来的处理函数，run() 结束时恢复
+        self.__previous_handlers = {signum: signal.signal(signum, handler) for signum, handler in handlers.items()}
+
+    def __restore_signal_handlers(self) -> None:
+        for signum, handler in self.__previous_handlers.items():
+            # 由 C 代码注册的处理函数无法在 Python 中恢复（getsignal 返回 None）
+            if handler is not None:
+                signal.signal(signum, handler)
+        self.__previous_handlers = {}
+
+    def __create_listener(self) -> socket.socket:
+        # 由旧进程传递过来的监听 socket，直接接管而不重新 bind
+        inherited_fd: str | None = os.environ.pop(ListenFdEnv, None)
+        if inherited_fd is not None:
+            sock_conn = create_socket(fileno=int(inherited_fd))
+            sock_conn.set_inheritable(False)
+            return sock_conn
+
         sock_conn = create_socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock_conn.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock_conn.bind((self.__host, self.__port))
-        sock_conn.listen(1)
+        sock_conn.listen(self.__backlog)
+        return sock_conn
+
+    def __reexec(self) -> None:
+        # 监听 socket 不关闭，通过 exec 原样交给新进程
+        self.__listener.settimeout(None)
+        self.__listener.set_inheritable(True)
+        env: dict[str, str] = dict(os.environ)
+        env[ListenFdEnv] = str(self.__listener.fileno())
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execve(sys.executable, sys.orig_argv, env)
+
+    def __serve(self) -> None:
+        while self.__running:
+            try:
+                conn, addr = self.__listener.accept()
+            except TimeoutError:
+                continue
+
+            self.__conn = conn
+            # 单次读写超时，避免空闲连接一直占住服务器
+            conn.settimeout(self.__conn_timeout)
+            try:
+                self.__process_request(conn, addr)
+            finally:
+                self.__conn = None
+                conn.close()
 
-        while True:
-            conn, _addr = sock_conn.accept()
-            self.__process_request(conn)
-            conn.close()
+    def run(self, warm_up: bool = False) -> None:
+        """
+        启动服务器\n
+        SIGINT / SIGTERM 触发优雅关闭（再次收到则立即退出），SIGHUP 触发热重载（重载期间收到 SIGINT / SIGTERM 则取消重载）
+        :param warm_up: 开始接受连接前是否预热静态文件缓存
+        """
+
+        self.__stop_event = threading.Event()
+        self.__drained_event = threading.Event()
+        self.__listener = self.__create_listener()
+        self.__install_signal_handlers()
+
+        # 预热期间新连接在监听队列中等待
+        if warm_up:
+            self.warm_up()
+
+        self.__running = True
+        self.__reloading = False
+        # 定期醒来检查停止标记
+        self.__listener.settimeout(AcceptPollInterval)
+        threading.Thread(target=self.__watch_drain, name='DrainWatchdog', daemon=True).start()
+
+        aborted: bool = False
+        try:
+            self.__serve()
+        except BaseException:
+            # 异常退出（包括 SystemExit / KeyboardInterrupt）时不重新执行
+            aborted = True
+            self.__reloading = False
+            raise
+        finally:
+            self.__running = False
+            self.__drained_event.set()
+            self.__stop_event.set()
+            if self.__access_log is not None:
+                # 写完剩余日志的时间不超过剩余的关闭期限，异常退出时不等待
+                remaining: float = 0.0 if aborted else max(0.0, self.__drain_deadline - time.monotonic())
+                self.__access_log.close(remaining)
+
+            # 重新执行时信号处理函数会随进程映像一起被替换，无需恢复
+            if not self.__reloading:
+                self.__restore_signal_handlers()
+                self.__listener.close()
+                self.__listener = None
+
+        # 只有 accept 循环正常退出才重新执行
+        if self.__reloading:
+            self.__reexec()
 
     def get(self, path: str):
         def decorator(func: Callable[[Request, Response], None]):
-            @functools.wraps(func)
-            def inner(_req: Request, _res: Response):
-                self.__get[path] = func
-
-            return inner
+            self.__get[path] = func
+            return func
 
         return decorator
 
     def post(self, path: str):
         def decorator(func: Callable[[Request, Response], None]):
-            @functools.wraps(func)
-            def inner(_req: Request, _res: Response):
-                self.__post[path] = func
-
-            return inner
+            self.__post[path] = func
+            return func
 
         return decorator
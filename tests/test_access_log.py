@@ -0,0 +1,106 @@
+import os
+import tempfile
+import time
+import unittest
+
+from http_server.access_log import AccessLog, AccessLogEntry, format_combined
+
+
+def make_entry(i: int = 0, user_agent: str | None = None) -> AccessLogEntry:
+    return AccessLogEntry('127.0.0.1', time.time(), 'GET', f'/{i}', 'HTTP/1.1', 200, 10, None, user_agent)
+
+
+def read_lines(file_path: str) -> list[str]:
+    with open(file_path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+class AccessLogTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp.name, 'access.log')
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_batch_written_in_order_on_close(self) -> None:
+        log = AccessLog(self.log_path, batch_size=7, flush_interval=10)
+        for i in range(50):
+            log.log(make_entry(i))
+        log.close()
+
+        lines = read_lines(self.log_path)
+        self.assertEqual(len(lines), 50)
+        self.assertEqual([line.split('"')[1].split(' ')[1] for line in lines], [f'/{i}' for i in range(50)])
+
+    def test_batch_waits_for_flush_interval(self) -> None:
+        log = AccessLog(self.log_path, batch_size=100, flush_interval=0.5)
+        for i in range(3):
+            log.log(make_entry(i))
+            time.sleep(0.05)
+
+        time.sleep(0.1)
+        self.assertFalse(os.path.exists(self.log_path))
+        time.sleep(0.6)
+        self.assertEqual(len(read_lines(self.log_path)), 3)
+        log.close()
+
+    def test_full_batch_written_before_flush_interval(self) -> None:
+        log = AccessLog(self.log_path, batch_size=2, flush_interval=10)
+        log.log(make_entry(1))
+        log.log(make_entry(2))
+
+        time.sleep(0.3)
+        self.assertEqual(len(read_lines(self.log_path)), 2)
+        log.close()
+
+    def test_rotate_by_size_keeps_backup_count(self) -> None:
+        log = AccessLog(self.log_path, batch_size=1, flush_interval=0.01, max_bytes=200, backup_count=2)
+        for i in range(20):
+            log.log(make_entry(i))
+            time.sleep(0.02)
+        log.close()
+
+        files = sorted(f for f in os.listdir(self.tmp.name))
+        self.assertEqual(files, ['access.log', 'access.log.1', 'access.log.2'])
+        for name in files:
+            size = os.path.getsize(os.path.join(self.tmp.name, name))
+            self.assertGreater(size, 0)
+            self.assertLessEqual(size, 200)
+
+    def test_rotate_by_time_does_not_create_empty_backup(self) -> None:
+        log = AccessLog(self.log_path, flush_interval=0.05, rotate_interval=0.5, backup_count=3)
+        log.log(make_entry(1))
+        time.sleep(1.2)
+        log.log(make_entry(2))
+        log.close()
+
+        self.assertEqual(len(read_lines(self.log_path + '.1')), 1)
+        self.assertFalse(os.path.exists(self.log_path + '.2'))
+        self.assertEqual(len(read_lines(self.log_path)), 1)
+
+    def test_drop_when_queue_full(self) -> None:
+        log = AccessLog(self.log_path, max_queue_size=1, flush_interval=0.01)
+        for i in range(10000):
+            log.log(make_entry(i))
+        log.close()
+
+        self.assertGreater(log.dropped, 0)
+        self.assertEqual(len(read_lines(self.log_path)) + log.dropped, 10000)
+
+    def test_block_when_queue_full(self) -> None:
+        log = AccessLog(self.log_path, max_queue_size=1, flush_interval=0.01, block_on_full=True)
+        for i in range(500):
+            log.log(make_entry(i))
+        log.close()
+
+        self.assertEqual(log.dropped, 0)
+        self.assertEqual(len(read_lines(self.log_path)), 500)
+
+    def test_combined_escapes_client_fields(self) -> None:
+        line = format_combined(make_entry(user_agent='ua" 200 1 "x\\\n'))
+        self.assertTrue(line.endswith('"-" "ua\\" 200 1 \\"x\\\\\\x0a"'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,22 @@
+import io
+import time
+import unittest
+
+from http_server.error_log import ErrorLog
+
+
+class ErrorLogTest(unittest.TestCase):
+    def test_messages_written_in_background(self) -> None:
+        stream = io.StringIO()
+        log = ErrorLog(stream)
+        log.log(ValueError('bad header'))
+        log.log('second')
+
+        deadline = time.monotonic() + 2
+        while stream.getvalue().count('\n') < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(stream.getvalue(), 'bad header\nsecond\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+RootDir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ServerScript: str = '''
+import os
+import signal
+import sys
+import time
+from http_server.server import Server
+from http_server.access_log import AccessLog
+
+print('start', os.getpid(), flush=True)
+app = Server('127.0.0.1', int(sys.argv[1]), drain_timeout=float(sys.argv[2])).set_static_dir(sys.argv[3])
+if len(sys.argv) > 4:
+    app.set_access_log(AccessLog(sys.argv[4], 'combined', flush_interval=60))
+
+
+@app.get('/slow')
+def slow(req, res):
+    time.sleep(1)
+    res.send_text('slow')
+
+
+app.run()
+print('exit', os.getpid(), flush=True)
+print('restored', signal.getsignal(signal.SIGINT) is signal.default_int_handler,
+      signal.getsignal(signal.SIGTERM) is signal.SIG_DFL, signal.getsignal(signal.SIGHUP) is signal.SIG_DFL, flush=True)
+'''
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def request(port: int, raw: bytes, timeout: float = 10.0) -> bytes:
+    with socket.create_connection(('127.0.0.1', port), timeout=timeout) as conn:
+        conn.sendall(raw)
+        data = bytearray()
+        while True:
+            chunk = conn.recv(4096)
+            if not chunk:
+                return bytes(data)
+            data.extend(chunk)
+
+
+# 服务器代码使用了 Python 3.12 的 f-string 语法
+@unittest.skipIf(sys.version_info < (3, 12), 'http_server requires Python 3.12+')
+class ServerTest(unittest.TestCase):
+    def start_server(self, drain_timeout: float = 10.0, access_log: bool = False) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with open(os.path.join(self.tmp.name, 'index.html'), 'w') as f:
+            f.write('hello')
+
+        self.port = get_free_port()
+        self.output_path = os.path.join(self.tmp.name, 'output.txt')
+        self.output = open(self.output_path, 'w')
+        self.addCleanup(self.output.close)
+        self.access_log_path = os.path.join(self.tmp.name, 'access.log')
+        args: list[str] = [str(self.port), str(drain_timeout), self.tmp.name]
+        if access_log:
+            args.append(self.access_log_path)
+        self.proc = subprocess.Popen(
+            [sys.executable, '-c', ServerScript, *args],
+            cwd=RootDir,
+            stdout=self.output,
+            stderr=subprocess.STDOUT
+        )
+        self.addCleanup(self.kill_server)
+        self.wait_until_ready()
+
+    def kill_server(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+
+    def wait_until_ready(self, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                if request(self.port, b'HEAD / HTTP/1.1\r\n\r\n').startswith(b'HTTP/1.1 200'):
+                    return
+            except OSError:
+                time.sleep(0.05)
+        self.fail('server did not start')
+
+    def read_output(self) -> list[str]:
+        with open(self.output_path) as f:
+            return f.read().splitlines()
+
+    def assert_exits_within(self, timeout: float) -> None:
+        try:
+            self.proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.fail(f'server still running {timeout}s later')
+
+    def test_stop_with_idle_client_respects_drain_timeout(self) -> None:
+        self.start_server(drain_timeout=1)
+        idle = socket.create_connection(('127.0.0.1', self.port))
+        self.addCleanup(idle.close)
+        time.sleep(0.3)
+
+        start = time.monotonic()
+        self.proc.send_signal(signal.SIGTERM)
+        self.assert_exits_within(4)
+        self.assertGreaterEqual(time.monotonic() - start, 0.9)
+        self.assertEqual(self.proc.returncode, 0)
+
+    def test_second_signal_exits_immediately(self) -> None:
+        self.start_server(drain_timeout=60)
+        idle = socket.create_connection(('127.0.0.1', self.port))
+        self.addCleanup(idle.close)
+        time.sleep(0.3)
+
+        self.proc.send_signal(signal.SIGTERM)
+        time.sleep(0.3)
+        self.proc.send_signal(signal.SIGTERM)
+        self.assert_exits_within(2)
+        self.assertEqual(self.proc.returncode, 1)
+
+    def test_in_flight_request_finishes_on_stop(self) -> None:
+        self.start_server()
+        result: list[bytes] = []
+        client = threading.Thread(target=lambda: result.append(request(self.port, b'GET /slow HTTP/1.1\r\n\r\n')))
+        client.start()
+        time.sleep(0.3)
+
+        self.proc.send_signal(signal.SIGTERM)
+        client.join(5)
+        self.assert_exits_within(5)
+        self.assertTrue(result and result[0].endswith(b'slow'))
+
+    def test_signal_handlers_restored_after_stop(self) -> None:
+        self.start_server()
+        self.proc.send_signal(signal.SIGTERM)
+        self.assert_exits_within(3)
+        self.assertEqual(self.read_output()[-1], 'restored True True True')
+
+    def test_reload_keeps_pid_and_listener(self) -> None:
+        self.start_server()
+        self.proc.send_signal(signal.SIGHUP)
+        time.sleep(1)
+
+        self.assertTrue(request(self.port, b'GET / HTTP/1.1\r\n\r\n').endswith(b'hello'))
+        self.assertEqual(self.read_output(), [f'start {self.proc.pid}'] * 2)
+
+        self.proc.send_signal(signal.SIGTERM)
+        self.assert_exits_within(3)
+
+    def test_stop_during_reload_cancels_it(self) -> None:
+        self.start_server()
+        client = threading.Thread(target=request, args=(self.port, b'GET /slow HTTP/1.1\r\n\r\n'))
+        client.start()
+        time.sleep(0.3)
+
+        self.proc.send_signal(signal.SIGHUP)
+        time.sleep(0.1)
+        self.proc.send_signal(signal.SIGTERM)
+        client.join(5)
+        self.assert_exits_within(5)
+        self.assertEqual(self.read_output()[:2], [f'start {self.proc.pid}', f'exit {self.proc.pid}'])
+
+    def test_options_has_allow_without_content_length(self) -> None:
+        self.start_server()
+        for path in ('/slow', '/index.html'):
+            response = request(self.port, f'OPTIONS {path} HTTP/1.1\r\n\r\n'.encode())
+            self.assertTrue(response.startswith(b'HTTP/1.1 204'), path)
+            self.assertIn(b'Allow: GET, HEAD, OPTIONS', response)
+            self.assertNotIn(b'Content-Length', response)
+
+    def test_options_for_deleted_file_is_not_found(self) -> None:
+        self.start_server()
+        file_path = os.path.join(self.tmp.name, 'gone.txt')
+        with open(file_path, 'w') as f:
+            f.write('x')
+        self.assertTrue(request(self.port, b'OPTIONS /gone.txt HTTP/1.1\r\n\r\n').startswith(b'HTTP/1.1 204'))
+
+        os.remove(file_path)
+        self.assertTrue(request(self.port, b'OPTIONS /gone.txt HTTP/1.1\r\n\r\n').startswith(b'HTTP/1.1 404'))
+
+    def test_head_sends_headers_only(self) -> None:
+        self.start_server()
+        response = request(self.port, b'HEAD /index.html HTTP/1.1\r\n\r\n')
+        self.assertIn(b'Content-Length: 5', response)
+        self.assertTrue(response.endswith(b'\r\n\r\n'))
+
+    def test_access_log_records_status_and_size(self) -> None:
+        self.start_server(access_log=True)
+        request(self.port, b'GET /index.html HTTP/1.1\r\nUser-Agent: test-agent\r\n\r\n')
+        request(self.port, b'HEAD /index.html HTTP/1.1\r\n\r\n')
+        request(self.port, b'GET /missing HTTP/1.1\r\nReferer: http://example.com/\r\n\r\n')
+
+        # flush_interval 很长，日志只会在 run() 退出时关闭访问日志才写入
+        self.proc.send_signal(signal.SIGTERM)
+        self.assert_exits_within(5)
+
+        with open(self.access_log_path) as f:
+            lines = f.read().splitlines()
+        # 第一行是 wait_until_ready 发出的 HEAD /
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith('127.0.0.1 - - ['))
+        self.assertTrue(lines[1].endswith('"GET /index.html HTTP/1.1" 200 5 "-" "test-agent"'))
+        self.assertTrue(lines[2].endswith('"HEAD /index.html HTTP/1.1" 200 - "-" "-"'))
+        self.assertTrue(lines[3].endswith('"GET /missing HTTP/1.1" 404 - "http://example.com/" "-"'))
+
+    def test_static_path_aliases_resolve_to_same_file(self) -> None:
+        self.start_server()
+        for path in ('/./index.html', '/.//index.html', '/a/../index.html', '/../index.html'):
+            self.assertTrue(request(self.port, f'GET {path} HTTP/1.1\r\n\r\n'.encode()).endswith(b'hello'), path)
+
+
+if __name__ == '__main__':
+    unittest.main()
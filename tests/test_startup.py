@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import unittest
+
+RootDir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code: str) -> set[str]:
+    """
+    在新的解释器中执行 code，返回执行后已加载的模块
+    """
+
+    output = subprocess.run(
+        [sys.executable, '-c', f'{code}\nimport sys\nprint("\\n".join(sys.modules))'],
+        cwd=RootDir,
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return set(output.splitlines())
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_package_import_loads_no_submodules(self) -> None:
+        modules = loaded_modules('import http_server')
+        self.assertIn('http_server', modules)
+        self.assertEqual({m for m in modules if m.startswith('http_server.')}, set())
+
+    # 服务器代码使用了 Python 3.12 的 f-string 语法
+    @unittest.skipIf(sys.version_info < (3, 12), 'http_server requires Python 3.12+')
+    def test_server_import_skips_optional_modules(self) -> None:
+        modules = loaded_modules('import http_server.server')
+        self.assertNotIn('tempfile', modules)
+        self.assertNotIn('typing', modules)
+        self.assertNotIn('http_server.access_log', modules)
+
+    @unittest.skipIf(sys.version_info < (3, 12), 'http_server requires Python 3.12+')
+    def test_getattr_resolves_and_caches(self) -> None:
+        import http_server
+        from http_server.server import Server
+
+        http_server.__dict__.pop('Server', None)
+        self.assertIs(http_server.Server, Server)
+        self.assertIs(http_server.__dict__['Server'], Server)
+
+        with self.assertRaises(AttributeError):
+            getattr(http_server, 'NotExported')
+
+
+@unittest.skipIf(sys.version_info < (3, 12), 'http_server requires Python 3.12+')
+class MimeTest(unittest.TestCase):
+    def test_case_insensitive(self) -> None:
+        from http_server.response import get_mime
+
+        self.assertEqual(get_mime('.HTML'), 'text/html; charset=utf-8')
+        self.assertEqual(get_mime('.Css', 'gbk'), 'text/css; charset=gbk')
+
+    def test_unknown_extension_falls_back(self) -> None:
+        from http_server.response import get_mime
+
+        self.assertEqual(get_mime('.unknown'), 'text/plain; charset=utf-8')
+        self.assertEqual(get_mime(''), 'text/plain; charset=utf-8')
+        self.assertEqual(get_mime('.unknown', 'gbk'), 'text/plain; charset=gbk')
+
+    def test_encodings_share_one_table(self) -> None:
+        from http_server.mime import MimeList
+        from http_server.response import get_mime
+
+        with self.assertRaises(TypeError):
+            MimeList['.md'] = 'text/markdown'
+        for ext in MimeList:
+            self.assertEqual(get_mime(ext).split(';')[0], get_mime(ext, 'gbk').split(';')[0])
+
+    def test_ext_name_is_lowercased(self) -> None:
+        from http_server.response import get_ext_name
+
+        self.assertEqual(get_ext_name('/www/Index.HTML'), '.html')
+        self.assertEqual(get_ext_name('/www/README'), '')
+
+
+if __name__ == '__main__':
+    unittest.main()